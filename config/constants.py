@@ -1,4 +1,5 @@
 # Configuration constants
+# Preset display names -> Windows filenames; resolved through the system font index (src/fonts.py)
 FONTS = {
     "Arial": "arial.ttf",
     "Arial Bold": "arialbd.ttf",
@@ -11,6 +12,22 @@ FONTS = {
     "Trebuchet MS": "trebuc.ttf"
 }
 
+# Common metric-compatible or look-alike faces for FONTS presets that are not installed
+FONT_SUBSTITUTES = {
+    "Arial": ["Liberation Sans", "Arimo", "Helvetica", "DejaVu Sans"],
+    "Arial Bold": ["Liberation Sans Bold", "Arimo Bold", "Helvetica Bold", "DejaVu Sans Bold"],
+    "Times New Roman": ["Liberation Serif", "Tinos", "Times", "DejaVu Serif"],
+    "Courier New": ["Liberation Mono", "Cousine", "Courier", "DejaVu Sans Mono"],
+    "Verdana": ["DejaVu Sans"],
+    "Georgia": ["Gelasio", "DejaVu Serif"],
+    "Impact": ["Anton", "DejaVu Sans Bold"],
+    "Comic Sans MS": ["Comic Neue"],
+    "Trebuchet MS": ["Fira Sans", "DejaVu Sans"]
+}
+
+# On-disk cache of scanned system fonts, rebuilt when a font directory changes
+FONT_INDEX_PATH = "~/.cache/markit/font_index.json"
+
 POSITIONS = [
     "center", "top left", "top right", 
     "bottom left", "bottom right", "top center",
@@ -27,6 +44,15 @@ DEFAULT_SETTINGS = {
     "angle": 0
 }
 
+# "auto" colour: black or white picked from the luminance under the watermark,
+# measured on a copy reduced to about sample_size px on its longest side
+AUTO_COLOR = {
+    "sample_size": 256,
+    "threshold": 128,
+    "light": "#ffffff",
+    "dark": "#000000"
+}
+
 WINDOW_SETTINGS = {
     "title": "MarkIT",
     "minsize": (1000, 600),
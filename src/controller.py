@@ -1,6 +1,6 @@
 from src.model import WatermarkModel
 from src.view import WatermarkView
-from config.constants import DEFAULT_SETTINGS, IMAGE_PATHS
+from config.constants import IMAGE_PATHS
 from tkinter import filedialog
 import os
 
@@ -8,8 +8,9 @@ class WatermarkController:
     def __init__(self, root):
         self.model = WatermarkModel()
         self.view = WatermarkView(root, IMAGE_PATHS)
+        self._syncing = False
         self.bind_events()
-        self.view.set_settings(DEFAULT_SETTINGS)
+        self.sync_controls()
 
     def bind_events(self):
         # Upload button
@@ -20,6 +21,11 @@ class WatermarkController:
         self.view.reset_btn.config(command=self.reset_all)
         self.view.save_btn.config(command=self.save_image)
 
+        # Layer stack
+        self.view.add_layer_btn.config(command=self.add_layer)
+        self.view.remove_layer_btn.config(command=self.remove_layer)
+        self.view.layer_select.bind("<<ComboboxSelected>>", lambda e: self.select_layer())
+
         # Live refresh
         for name, data in self.view.controls.items():
             data["var"].trace_add("write", lambda *args: self.refresh_preview())
@@ -31,28 +37,59 @@ class WatermarkController:
         )
         if file_path and self.model.load_image(file_path):
             self.view.canvas.delete("upload_btn")  # remove upload button
+            self.model.update_layer(self.model.active_index, self.view.get_settings())
+            self.view.display_image(self.model.original_image, self.model.layers, self.model.active_index)
+            # Auto colour samples the preview the view just scaled
+            self.model.set_sample_image(self.view.preview_image)
             self.refresh_preview()
 
     def refresh_preview(self):
+        if self._syncing:
+            return
+        self.model.update_layer(self.model.active_index, self.view.get_settings())
         if not self.model.original_image:
             return
-        self.model.settings.update(self.view.get_settings())
-        self.view.display_image(self.model.original_image)
+        self.model.update_auto_colors()
+        self.view.update_layers(self.model.layers, self.model.active_index)
+
+    def sync_controls(self):
+        """Load the active layer's settings into the controls without echoing them back."""
+        self._syncing = True
+        try:
+            self.view.set_settings(self.model.settings)
+        finally:
+            self._syncing = False
+        self.view.set_layer_names(len(self.model.layers), self.model.active_index)
+        self.refresh_preview()
+
+    def add_layer(self):
+        self.model.add_layer()
+        self.sync_controls()
+
+    def remove_layer(self):
+        if self.model.remove_layer():
+            self.sync_controls()
+
+    def select_layer(self):
+        index = self.view.selected_layer_index()
+        if index >= 0:
+            self.model.select_layer(index)
+            self.sync_controls()
 
     def discard_watermark(self):
         if self.model.original_image:
-            self.view.set_settings(DEFAULT_SETTINGS)
-            self.refresh_preview()
+            self.model.reset_layers()
+            self.sync_controls()
 
     def reset_all(self):
-        self.view.set_settings(DEFAULT_SETTINGS)
         self.view.show_upload_button()
         self.model = WatermarkModel()
+        self.sync_controls()
 
     def save_image(self):
         if not self.model.original_image:
             return
-        self.model.settings.update(self.view.get_settings())
+        self.model.update_layer(self.model.active_index, self.view.get_settings())
         final_img = self.model.apply_watermark()
         if not final_img:
             return
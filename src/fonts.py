@@ -0,0 +1,169 @@
+import json
+import os
+import sys
+from functools import lru_cache
+from PIL import ImageFont
+from config.constants import FONTS, FONT_SUBSTITUTES, FONT_INDEX_PATH
+
+FONT_EXTENSIONS = (".ttf", ".otf", ".ttc")
+_INDEX_VERSION = 1
+
+def _font_dirs():
+    """Standard system and user font directories for the current platform."""
+    home = os.path.expanduser("~")
+    if sys.platform.startswith("win"):
+        windir = os.environ.get("WINDIR", r"C:\Windows")
+        local = os.environ.get("LOCALAPPDATA", os.path.join(home, "AppData", "Local"))
+        dirs = [os.path.join(windir, "Fonts"),
+                os.path.join(local, "Microsoft", "Windows", "Fonts")]
+    elif sys.platform == "darwin":
+        dirs = ["/System/Library/Fonts", "/Library/Fonts",
+                os.path.join(home, "Library", "Fonts")]
+    else:
+        data_home = os.environ.get("XDG_DATA_HOME", os.path.join(home, ".local", "share"))
+        dirs = ["/usr/share/fonts", "/usr/local/share/fonts",
+                os.path.join(data_home, "fonts"), os.path.join(home, ".fonts")]
+    return [d for d in dirs if os.path.isdir(d)]
+
+def _dir_mtimes(roots):
+    """mtime of every directory under roots; adding/removing a font bumps its parent's."""
+    mtimes = {}
+    for root in roots:
+        for dirpath, _, _ in os.walk(root):
+            try:
+                mtimes[dirpath] = os.stat(dirpath).st_mtime
+            except OSError:
+                pass
+    return mtimes
+
+def _display_name(family, style):
+    if not style or style.lower() in ("regular", "normal", "roman", "book"):
+        return family
+    return f"{family} {style}"
+
+def _read_faces(path):
+    """Yield (display_name, face_index) for each face in a font file."""
+    index = 0
+    while True:
+        try:
+            font = ImageFont.truetype(path, 12, index=index)
+        except Exception:
+            return
+        family, style = font.getname()
+        if family:
+            yield _display_name(family, style), index
+        if not path.lower().endswith(".ttc"):
+            return
+        index += 1
+
+class FontIndex:
+    """
+    Maps font display names ("Arial Bold") to (path, face_index).
+    Built by scanning the font directories once and persisted to disk;
+    rebuilt only when one of the scanned directories' mtimes changes.
+    """
+    def __init__(self, cache_path=FONT_INDEX_PATH, dirs=None):
+        self.cache_path = os.path.expanduser(cache_path) if cache_path else None
+        self.dirs = _font_dirs() if dirs is None else dirs
+        self.fonts = {}
+        self.files = {}  # lowercase basename -> display name, for legacy FONTS values
+        self._load_or_build()
+
+    def _load_or_build(self):
+        mtimes = _dir_mtimes(self.dirs)
+        data = self._read_cache()
+        if not data or data.get("version") != _INDEX_VERSION or data.get("mtimes") != mtimes:
+            data = self._build(mtimes)
+            self._write_cache(data)
+        self.fonts = {name: tuple(entry) for name, entry in data["fonts"].items()}
+        self.files = data["files"]
+
+    def _build(self, mtimes):
+        fonts, files = {}, {}
+        for dirpath in sorted(mtimes):
+            try:
+                entries = sorted(os.listdir(dirpath))
+            except OSError:
+                continue
+            for filename in entries:
+                if not filename.lower().endswith(FONT_EXTENSIONS):
+                    continue
+                path = os.path.join(dirpath, filename)
+                for name, index in _read_faces(path):
+                    fonts.setdefault(name, (path, index))
+                    files.setdefault(filename.lower(), name)
+        return {"version": _INDEX_VERSION, "mtimes": mtimes, "fonts": fonts, "files": files}
+
+    def _read_cache(self):
+        if not self.cache_path:
+            return None
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, data):
+        if not self.cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp = self.cache_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.cache_path)
+        except OSError as e:
+            print(f"Error writing font index: {e}")
+
+    def names(self):
+        """Display names for the font picker, sorted."""
+        return sorted(self.fonts, key=str.lower)
+
+    def resolve(self, name):
+        """
+        Indexed display name to use for name, or None if nothing is indexed.
+        Tries, in order: the display name itself, its FONTS filename (or a bare
+        filename such as "arialbd.ttf"), the FONT_SUBSTITUTES equivalents, the
+        first regular sans family, then any indexed face.
+        """
+        if name in self.fonts:
+            return name
+        filename = FONTS.get(name, name)
+        indexed = self.files.get(str(filename).lower())
+        if indexed:
+            return indexed
+        for substitute in FONT_SUBSTITUTES.get(name, ()):
+            if substitute in self.fonts:
+                return substitute
+        names = self.names()
+        sans = [n for n in names if n.endswith("Sans")]
+        return (sans or names or [None])[0]
+
+    def lookup(self, name):
+        """Returns (path, face_index) of the face resolve() picks, or None."""
+        resolved = self.resolve(name)
+        return self.fonts[resolved] if resolved else None
+
+@lru_cache(maxsize=1)
+def get_font_index():
+    return FontIndex()
+
+def font_names():
+    """Names for the FONT combobox: indexed system fonts, or the FONTS presets if none were found."""
+    return get_font_index().names() or list(FONTS.keys())
+
+def font_name(name):
+    """The font picker entry name renders with (name itself if nothing is indexed)."""
+    return get_font_index().resolve(name) or name
+
+@lru_cache(maxsize=64)
+def load_font(name, size):
+    """Resolve a font by name via the index; Pillow's default font is used only if no font is indexed."""
+    entry = get_font_index().lookup(name)
+    if entry:
+        path, index = entry
+        try:
+            return ImageFont.truetype(path, size, index=index)
+        except Exception as e:
+            print(f"Font error: {e}")
+    return ImageFont.load_default(size)
@@ -1,5 +1,7 @@
-from PIL import Image, ImageDraw, ImageFont, ImageColor
-from config.constants import FONTS, DEFAULT_SETTINGS
+import itertools
+from PIL import Image, ImageDraw, ImageColor, ImageStat
+from config.constants import DEFAULT_SETTINGS, AUTO_COLOR
+from src.fonts import font_name, load_font
 
 def _parse_hex_or_fallback(color_str, default=(255, 255, 255)):
     try:
@@ -39,62 +41,304 @@ def _make_text_image(text, font, rgba, angle):
     rw, rh = txt.size
     return txt, rw, rh, tw, th
 
+def _clip_box(box, img_w, img_h):
+    x0, y0, x1, y1 = box
+    return max(0, x0), max(0, y0), min(img_w, x1), min(img_h, y1)
+
+def _merge_boxes(boxes):
+    """
+    Merge overlapping non-empty boxes until the remaining ones are disjoint,
+    so far-apart regions are rebuilt separately instead of as one big box.
+    """
+    merged = []
+    for box in boxes:
+        if box[0] >= box[2] or box[1] >= box[3]:
+            continue
+        # Absorb every box this one overlaps; repeat since the union can grow into others
+        overlapping = True
+        while overlapping:
+            overlapping = False
+            for other in merged:
+                if box[0] < other[2] and other[0] < box[2] and box[1] < other[3] and other[1] < box[3]:
+                    merged.remove(other)
+                    box = (min(box[0], other[0]), min(box[1], other[1]),
+                           max(box[2], other[2]), max(box[3], other[3]))
+                    overlapping = True
+                    break
+        merged.append(box)
+    return merged
+
+def _recolor(stamp, rgb):
+    """Same glyph coverage and opacity (alpha), new solid colour."""
+    out = Image.new("RGBA", stamp.size, tuple(rgb) + (0,))
+    out.putalpha(stamp.getchannel("A"))
+    return out
+
+def _estimate_luminance(sample, box, scale=1.0):
+    """
+    Mean luminance (0-255) of an image box. Only a grid of at most
+    AUTO_COLOR["sample_size"] px per side is read from inside the box.
+    """
+    x0, y0, x1, y1 = (int(v * scale) for v in box)
+    x1, y1 = max(x1, x0 + 1), max(y1, y0 + 1)
+    w, h = x1 - x0, y1 - y0
+    ratio = min(1.0, AUTO_COLOR["sample_size"] / max(w, h))
+    size = (max(1, int(w * ratio)), max(1, int(h * ratio)))
+    grid = sample.resize(size, Image.NEAREST, box=(x0, y0, x1, y1))
+    return ImageStat.Stat(grid.convert("L")).mean[0]
+
+def _contrasting_rgb(luminance):
+    light, dark = AUTO_COLOR["light"], AUTO_COLOR["dark"]
+    return _parse_hex_or_fallback(dark if luminance >= AUTO_COLOR["threshold"] else light)
+
+class WatermarkLayer:
+    """
+    A single text watermark with its own settings and cached rendered stamp.
+    The stamp is only re-rendered when a setting in STAMP_KEYS changes;
+    position only affects where the stamp is placed.
+    """
+    STAMP_KEYS = ("text", "font", "size", "color", "opacity", "angle")
+    _ids = itertools.count(1)
+
+    def __init__(self, settings=None):
+        self.id = next(WatermarkLayer._ids)
+        self.settings = DEFAULT_SETTINGS.copy()
+        if settings:
+            self.settings.update(settings)
+        # Store the face the font actually resolves to, so the picker shows it
+        self.settings["font"] = font_name(str(self.settings["font"]))
+        self._stamp = None
+        self._auto_rgb = _parse_hex_or_fallback(AUTO_COLOR["light"])
+
+    def update(self, settings):
+        """Merge settings; drops the cached stamp only if a STAMP_KEYS value changed."""
+        changed = {k for k, v in settings.items() if self.settings.get(k) != v}
+        if changed:
+            self.settings.update(settings)
+            if changed.intersection(self.STAMP_KEYS):
+                self._stamp = None
+        return bool(changed)
+
+    @property
+    def auto_color(self):
+        return str(self.settings.get("color", "")).lower() == "auto"
+
+    def set_auto_color(self, rgb):
+        """Recolour the cached stamp for auto mode; no re-render is needed."""
+        rgb = tuple(rgb)
+        if rgb == self._auto_rgb:
+            return
+        self._auto_rgb = rgb
+        if self._stamp is not None:
+            self._stamp = _recolor(self._stamp, rgb)
+
+    @property
+    def stamp(self):
+        """The rendered (rotated) RGBA watermark, rendered on first access."""
+        if self._stamp is None:
+            self._stamp = self._render()
+        return self._stamp
+
+    def _render(self):
+        # Font
+        try:
+            size = int(self.settings["size"])
+        except Exception:
+            size = DEFAULT_SETTINGS["size"]
+        font = load_font(str(self.settings["font"]), size)
+
+        # Color + opacity
+        if self.auto_color:
+            rgb = self._auto_rgb
+        else:
+            rgb = _parse_hex_or_fallback(str(self.settings["color"]))
+        try:
+            opacity = int(self.settings["opacity"])
+        except Exception:
+            opacity = 255
+        rgba = tuple(rgb) + (max(0, min(255, opacity)),)
+
+        try:
+            angle = int(self.settings.get("angle", 0))
+        except Exception:
+            angle = 0
+        text = str(self.settings.get("text", ""))
+
+        txt_img, _, _, _, _ = _make_text_image(text, font, rgba, angle)
+        return txt_img
+
 class WatermarkModel:
     def __init__(self):
         self.image_path = None
         self.original_image = None
         self.watermarked_image = None
-        self.settings = DEFAULT_SETTINGS.copy()
+        self.sample_image = None
+        self.layers = [WatermarkLayer()]
+        self.active_index = 0
+
+        # Compositing state: (box, stamp) each layer was last pasted with, and image
+        # regions that must be rebuilt on the next apply_watermark()
+        self._placed = {}
+        self._stale_boxes = []
+
+    @property
+    def active_layer(self):
+        return self.layers[self.active_index]
+
+    @property
+    def settings(self):
+        """Settings of the active layer."""
+        return self.active_layer.settings
 
     def load_image(self, file_path):
         try:
             self.image_path = file_path
             self.original_image = Image.open(file_path).convert("RGBA")
+            self.sample_image = None
+            self.watermarked_image = None
+            self._placed = {}
+            self._stale_boxes = []
             return True
         except Exception as e:
             print(f"Error loading image: {e}")
             return False
 
-    def apply_watermark(self):
-        if not self.original_image:
-            return None
+    # ---------- Layer stack ----------
+    def add_layer(self, settings=None):
+        self.layers.append(WatermarkLayer(settings))
+        self.active_index = len(self.layers) - 1
+        return self.active_layer
 
-        base = self.original_image.copy()  # RGBA
-        W, H = base.size
-        draw = ImageDraw.Draw(base, "RGBA")
+    def remove_layer(self, index=None):
+        """Remove a layer (the active one by default). The last layer is kept."""
+        if len(self.layers) <= 1:
+            return False
+        index = self.active_index if index is None else index
+        if not 0 <= index < len(self.layers):
+            return False
+        layer = self.layers.pop(index)
+        placed = self._placed.pop(layer.id, None)
+        if placed:
+            self._stale_boxes.append(placed[0])
+        if index < self.active_index:
+            self.active_index -= 1
+        self.active_index = min(self.active_index, len(self.layers) - 1)
+        return True
 
-        # Font
-        try:
-            font_file = FONTS.get(self.settings["font"], "arial.ttf")
-            font = ImageFont.truetype(font_file, int(self.settings["size"]))
-        except Exception as e:
-            print(f"Font error: {e}")
-            font = ImageFont.load_default()
+    def select_layer(self, index):
+        if 0 <= index < len(self.layers):
+            self.active_index = index
 
-        # Color + opacity
-        rgb = _parse_hex_or_fallback(str(self.settings["color"]))
-        try:
-            opacity = int(self.settings["opacity"])
-        except Exception:
-            opacity = 255
-        rgba = tuple(rgb) + (max(0, min(255, opacity)),)
+    def update_layer(self, index, settings):
+        return self.layers[index].update(settings)
 
-        angle = int(self.settings.get("angle", 0))
-        text = str(self.settings.get("text", ""))
+    def reset_layers(self):
+        for layer in self.layers:
+            placed = self._placed.pop(layer.id, None)
+            if placed:
+                self._stale_boxes.append(placed[0])
+        self.layers = [WatermarkLayer()]
+        self.active_index = 0
 
-        # Render the watermark image (rotated)
-        txt_img, rW, rH, _, _ = _make_text_image(text, font, rgba, angle)
+    # ---------- Rendering ----------
+    def layer_box(self, layer, img_w, img_h):
+        """Placement box (x0, y0, x1, y1) of a layer's stamp in image pixels."""
+        stamp = layer.stamp
+        rW, rH = stamp.size
 
         # Desired position -> center coordinates on the image
-        cx, cy = self._resolve_center_position(self.settings.get("position", "center"), W, H, rW, rH)
+        cx, cy = self._resolve_center_position(layer.settings.get("position", "center"), img_w, img_h, rW, rH)
 
         # Clamp so the watermark stays fully inside the image
-        px = max(0, min(int(cx - rW / 2), W - rW))
-        py = max(0, min(int(cy - rH / 2), H - rH))
+        px = max(0, min(int(cx - rW / 2), img_w - rW))
+        py = max(0, min(int(cy - rH / 2), img_h - rH))
+        return px, py, px + rW, py + rH
+
+    def set_sample_image(self, image):
+        """
+        Reuse an already scaled copy of the image (e.g. the preview) for auto
+        colour. Only kept if it is actually smaller than the original.
+        """
+        if image is not None and self.original_image and image.width < self.original_image.width:
+            self.sample_image = image
+        else:
+            self.sample_image = None
+
+    def update_auto_colors(self):
+        """
+        Pick a contrasting colour for every layer in auto mode from the mean
+        luminance under its placement box, read from the preview-scale image
+        when one was provided and from the original's box otherwise.
+        """
+        if not self.original_image:
+            return
+        W, H = self.original_image.size
+        sample, scale = self.original_image, 1.0
+        if self.sample_image is not None:
+            sample, scale = self.sample_image, self.sample_image.width / W
+
+        for layer in self.layers:
+            if not layer.auto_color:
+                continue
+            box = _clip_box(self.layer_box(layer, W, H), W, H)
+            layer.set_auto_color(_contrasting_rgb(_estimate_luminance(sample, box, scale)))
+
+    def apply_watermark(self):
+        """
+        Composite all layers onto the image. Only layers whose stamp or
+        placement changed since the last call trigger work: their old/new
+        regions, merged where they overlap, are each rebuilt from the original
+        and every layer is stamped over them in a single pass.
+
+        The returned image is live: later calls patch it in place, so copy it
+        if an earlier result must be kept.
+        """
+        if not self.original_image:
+            return None
+
+        self.update_auto_colors()
+        W, H = self.original_image.size
+        full = self.watermarked_image is None
+
+        boxes = {}
+        dirty = list(self._stale_boxes)
+        for layer in self.layers:
+            box = self.layer_box(layer, W, H)
+            boxes[layer.id] = (box, layer.stamp)
+            old = self._placed.get(layer.id)
+            if old is None or old[1] is not layer.stamp or old[0] != box:
+                dirty.append(box)
+                if old:
+                    dirty.append(old[0])
+
+        if full:
+            base = self.original_image.copy()  # RGBA
+            regions = [(0, 0, W, H)]
+        else:
+            base = self.watermarked_image
+            regions = _merge_boxes([_clip_box(b, W, H) for b in dirty])
 
-        # Paste with alpha
-        base.alpha_composite(txt_img, (px, py))
+        for region in regions:
+            # Rebuild each affected region once, then stamp every layer over it.
+            # A full render stamps straight onto the fresh copy.
+            x0, y0, x1, y1 = region
+            patch = base if full else self.original_image.crop(region)
+            for layer in self.layers:
+                lx0, ly0, lx1, ly1 = boxes[layer.id][0]
+                ix0, iy0 = max(x0, lx0), max(y0, ly0)
+                ix1, iy1 = min(x1, lx1), min(y1, ly1)
+                if ix0 >= ix1 or iy0 >= iy1:
+                    continue
+                patch.alpha_composite(
+                    layer.stamp,
+                    dest=(ix0 - x0, iy0 - y0),
+                    source=(ix0 - lx0, iy0 - ly0, ix1 - lx0, iy1 - ly0),
+                )
+            if not full:
+                base.paste(patch, (x0, y0))
 
+        self._placed = boxes
+        self._stale_boxes = []
         self.watermarked_image = base
         return self.watermarked_image
 
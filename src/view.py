@@ -1,37 +1,9 @@
 from tkinter import *
 from tkinter import ttk, colorchooser
 from components.GradientButton import GradientButton
-from config.constants import POSITIONS, FONTS, WINDOW_SETTINGS
-from PIL import Image, ImageTk, ImageDraw, ImageFont, ImageColor
-
-
-def _parse_hex(color_str, default=(255, 255, 255)):
-    try:
-        rgb = ImageColor.getrgb(color_str)
-        if len(rgb) == 4:
-            rgb = rgb[:3]
-        return rgb
-    except Exception:
-        return default
-
-
-def _make_text_image(text, font, rgba, angle):
-    tmp = Image.new("RGBA", (2, 2), (0, 0, 0, 0))
-    d = ImageDraw.Draw(tmp)
-    bbox = d.textbbox((0, 0), text, font=font)
-    tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
-
-    pad = max(10, int(0.2 * max(tw, th)))
-    W, H = tw + 2 * pad, th + 2 * pad
-
-    txt = Image.new("RGBA", (W, H), (0, 0, 0, 0))
-    td = ImageDraw.Draw(txt)
-    cx, cy = W // 2, H // 2
-    td.text((cx - tw // 2, cy - th // 2), text, font=font, fill=rgba)
-
-    if angle:
-        txt = txt.rotate(angle, expand=True, resample=Image.BICUBIC)
-    return txt
+from config.constants import POSITIONS, WINDOW_SETTINGS
+from src.fonts import font_names
+from PIL import Image, ImageTk
 
 
 class WatermarkView:
@@ -45,14 +17,17 @@ class WatermarkView:
 
         # State for preview mapping
         self._current_image = None
+        self.preview_image = None
         self._img_size = (0, 0)
         self._disp_size = (0, 0)
         self._offset = (0, 0)
         self._scale = 1.0
 
-        # Watermark overlay state
+        # Watermark overlay state: one canvas item per layer, keyed by layer id
+        self._layers = []
+        self._active_index = 0
+        self._overlays = {}
         self.watermark_item = None
-        self.overlay_photo = None
         self.overlay_size = (0, 0)
         self.drag_data = {"x": 0, "y": 0, "item": None}
 
@@ -90,6 +65,8 @@ class WatermarkView:
         Label(self.control_frame, text="WATERMARK OPTIONS",
             font=("Segoe UI", 15, "bold"), bg="#3740ec", fg="white").pack(pady=10)
 
+        self._create_layer_controls()
+
         self.controls = {}
         self._create_controls()
 
@@ -158,11 +135,26 @@ class WatermarkView:
             font=("Segoe UI", 15, "bold")
             ).pack(pady=20)
 
+    def _create_layer_controls(self):
+        frame = Frame(self.control_frame, bg="#3740ec")
+        frame.pack(fill=X, padx=15, pady=5)
+        Label(frame, text="LAYER", font=("Arial", 10, "bold"),
+            bg="#3740ec", fg="white", width=12, anchor="w").pack(side=LEFT)
+
+        self.remove_layer_btn = Button(frame, text="-", padx=6)
+        self.remove_layer_btn.pack(side=RIGHT)
+        self.add_layer_btn = Button(frame, text="+", padx=6)
+        self.add_layer_btn.pack(side=RIGHT)
+
+        self.layer_var = StringVar()
+        self.layer_select = ttk.Combobox(frame, textvariable=self.layer_var, state="readonly")
+        self.layer_select.pack(side=RIGHT, fill=X, expand=True)
+
     def _create_controls(self):
         self.create_control("TEXT", "text", Entry)
         self.create_control("POSITION", "position", ttk.Combobox, values=POSITIONS)
         self.create_control("SIZE", "size", Scale, from_=10, to=200)
-        self.create_control("FONT", "font", ttk.Combobox, values=list(FONTS.keys()))
+        self.create_control("FONT", "font", ttk.Combobox, values=font_names())
         self.create_control("COLOR", "color", Entry)
         self.create_control("OPACITY", "opacity", Scale, from_=0, to=255)
         self.create_control("ANGLE", "angle", Scale, from_=-90, to=90)
@@ -201,6 +193,7 @@ class WatermarkView:
         self.controls[name] = {"var": var, "widget": control}
 
         if name == "color":
+            Button(frame, text="Auto", command=lambda: var.set("auto"), padx=6).pack(side=RIGHT)
             Button(frame, text="Pick", command=self.show_color_picker, padx=6).pack(side=RIGHT)
 
     def show_color_picker(self):
@@ -209,8 +202,11 @@ class WatermarkView:
             self.controls["color"]["var"].set(color[1])
 
     # ---------- Image Display Methods ----------
-    def display_image(self, image):
+    def display_image(self, image, layers=None, active_index=None):
         self._current_image = image
+        if layers is not None:
+            self._layers = layers
+            self._active_index = active_index or 0
         W, H = image.size
         self._img_size = (W, H)
 
@@ -227,64 +223,87 @@ class WatermarkView:
         self._offset = (off_x, off_y)
 
         disp_img = image.resize((disp_w, disp_h), Image.LANCZOS)
+        self.preview_image = disp_img
         self.display_photo = ImageTk.PhotoImage(disp_img)
 
         self.canvas.delete("all")
+        self._overlays = {}
         self.canvas.create_image(off_x, off_y, anchor="nw", image=self.display_photo)
-        self._draw_watermark_overlay()
+        self._draw_watermark_overlays()
+
+    def update_layers(self, layers, active_index):
+        """Refresh watermark overlays without re-scaling the base image."""
+        self._layers = layers
+        self._active_index = active_index
+        self.set_layer_names(len(layers), active_index)
+        if self._current_image is not None:
+            self._draw_watermark_overlays()
+
+    def set_layer_names(self, count, active_index):
+        names = [f"Layer {i + 1}" for i in range(count)]
+        self.layer_select.config(values=names)
+        self.layer_var.set(names[active_index])
+
+    def selected_layer_index(self):
+        try:
+            return self.layer_select.current()
+        except Exception:
+            return -1
 
     def redraw(self):
         if self._current_image is not None:
             self.display_image(self._current_image)
 
-    def _draw_watermark_overlay(self):
+    def _draw_watermark_overlays(self):
+        """
+        Keep one canvas item per layer in stack order. A layer's PhotoImage is
+        rebuilt only when the model re-rendered its stamp.
+        """
         if self._current_image is None:
             return
 
-        settings = self._current_settings()
-        text = settings["text"]
-        size = int(settings["size"])
-        font_name = settings["font"]
-        color = settings["color"]
-        opacity = int(settings["opacity"])
-        angle = int(settings["angle"])
-        pos = settings["position"]
+        live = {layer.id for layer in self._layers}
+        for layer_id in list(self._overlays):
+            if layer_id not in live:
+                self.canvas.delete(self._overlays.pop(layer_id)["item"])
 
-        try:
-            font_file = FONTS.get(font_name, "arial.ttf")
-            font = ImageFont.truetype(font_file, size)
-        except Exception:
-            font = ImageFont.load_default()
-
-        rgba = tuple(_parse_hex(color)) + (max(0, min(255, opacity)),)
-        txt_img = _make_text_image(text, font, rgba, angle)
-        self.overlay_size = (txt_img.width, txt_img.height)
-        self.overlay_photo = ImageTk.PhotoImage(txt_img)
-
-        x, y = self._resolve_canvas_center(pos)
-        self.watermark_item = self.canvas.create_image(
-            int(x), int(y),
-            image=self.overlay_photo,
-            anchor="center"
-        )
-
-        self.canvas.tag_bind(self.watermark_item, "<Enter>", lambda e: self.canvas.config(cursor="hand2"))
-        self.canvas.tag_bind(self.watermark_item, "<Leave>", lambda e: self.canvas.config(cursor=""))
+        self.watermark_item = None
+        for i, layer in enumerate(self._layers):
+            overlay = self._overlays.get(layer.id)
+            stamp = layer.stamp
+            if overlay is None or overlay["stamp"] is not stamp:
+                photo = ImageTk.PhotoImage(stamp)
+                if overlay is None:
+                    item = self.canvas.create_image(0, 0, image=photo, anchor="center")
+                else:
+                    item = overlay["item"]
+                    self.canvas.itemconfig(item, image=photo)
+                overlay = {"item": item, "stamp": stamp, "photo": photo, "size": stamp.size}
+                self._overlays[layer.id] = overlay
+
+            x, y = self._resolve_canvas_center(layer.settings.get("position", "center"), overlay["size"])
+            self.canvas.coords(overlay["item"], int(x), int(y))
+            self.canvas.tag_raise(overlay["item"])
+
+            if i == self._active_index:
+                self.watermark_item = overlay["item"]
+                self.overlay_size = overlay["size"]
+
+        # Only the active layer is draggable
+        for overlay in self._overlays.values():
+            item = overlay["item"]
+            if item == self.watermark_item:
+                self.canvas.tag_bind(item, "<Enter>", lambda e: self.canvas.config(cursor="hand2"))
+                self.canvas.tag_bind(item, "<Leave>", lambda e: self.canvas.config(cursor=""))
+            else:
+                self.canvas.tag_unbind(item, "<Enter>")
+                self.canvas.tag_unbind(item, "<Leave>")
 
     # ---------- Helper Methods ----------
-    def _current_settings(self):
-        s = {name: data["var"].get() for name, data in self.controls.items()}
-        for k in ("size", "opacity", "angle"):
-            try:
-                s[k] = int(s[k])
-            except Exception:
-                pass
-        return s
-
-    def _resolve_canvas_center(self, pos):
+    def _resolve_canvas_center(self, pos, overlay_size):
         off_x, off_y = self._offset
         disp_w, disp_h = self._disp_size
-        ow, oh = self.overlay_size
+        ow, oh = overlay_size
         pad = max(8, int(0.02 * min(disp_w, disp_h)))
 
         if isinstance(pos, str) and pos.startswith("custom_pct:"):
@@ -382,6 +401,9 @@ class WatermarkView:
     def show_upload_button(self):
         self.canvas.delete("all")
         self._current_image = None
+        self.preview_image = None
+        self._overlays = {}
+        self.watermark_item = None
         self._center_upload_button()
 
     def get_settings(self):
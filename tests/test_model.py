@@ -0,0 +1,61 @@
+from PIL import Image
+from src.model import WatermarkModel
+
+
+def _load(tmp_path, size=(400, 300)):
+    path = tmp_path / "base.png"
+    img = Image.new("RGBA", size)
+    img.putdata([(x % 256, (x // 7) % 256, 90, 255) for x in range(size[0] * size[1])])
+    img.save(path)
+    model = WatermarkModel()
+    assert model.load_image(str(path))
+    return model
+
+
+def _fresh_render(model):
+    fresh = WatermarkModel()
+    fresh.load_image(model.image_path)
+    for i, layer in enumerate(model.layers):
+        if i:
+            fresh.add_layer()
+        fresh.update_layer(i, layer.settings)
+    return fresh.apply_watermark()
+
+
+def test_incremental_render_matches_fresh_render(tmp_path):
+    model = _load(tmp_path)
+    model.update_layer(0, {"text": "(c) 2026", "position": "bottom right", "color": "#ffffff"})
+    model.apply_watermark()
+
+    model.add_layer({"text": "BRAND", "opacity": 60, "angle": 30})
+    assert model.apply_watermark().tobytes() == _fresh_render(model).tobytes()
+
+    model.update_layer(0, {"position": "top left"})
+    model.update_layer(1, {"size": 48, "color": "auto"})
+    assert model.apply_watermark().tobytes() == _fresh_render(model).tobytes()
+
+    model.remove_layer(0)
+    assert model.apply_watermark().tobytes() == _fresh_render(model).tobytes()
+
+
+def test_position_change_keeps_cached_stamp(tmp_path):
+    model = _load(tmp_path)
+    stamp = model.layers[0].stamp
+
+    model.update_layer(0, {"position": "bottom left"})
+    assert model.layers[0].stamp is stamp
+
+    model.update_layer(0, {"text": "changed"})
+    assert model.layers[0].stamp is not stamp
+
+
+def test_remove_earlier_layer_keeps_active_layer(tmp_path):
+    model = _load(tmp_path)
+    model.add_layer()
+    model.add_layer()
+    model.select_layer(1)
+    active = model.active_layer
+
+    assert model.remove_layer(0)
+    assert model.active_layer is active
+    assert not model.remove_layer(5)